@@ -3,22 +3,92 @@ Latitude API client module
 
 This module handles all interactions with the Latitude API.
 It can be easily replaced with the official Latitude Python SDK in the future.
+
+Each LatitudeClient keeps a pooled httpx client with HTTP/2 enabled, so
+repeated and concurrent requests to the gateway share connections.
 """
 
-from typing import Any, Dict
+import asyncio
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import httpx
 
 from utils import (
+    TEMPLATE_SOURCE_FIELDS,
     LatitudeAPIError,
     LatitudeAuthenticationError,
     LatitudeNotFoundError,
 )
 
+_loads: Callable[[bytes], Any]
+_dumps: Callable[[Any], bytes]
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # pragma: no cover - depends on optional extra
+    _loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _dumps = _json_dumps
+
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on optional extra
+    msgspec = None  # type: ignore[assignment]
+
+try:
+    import ijson  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - depends on optional extra
+    ijson = None
+
+
+def _build_template_fields_decoder() -> Optional[Callable[[bytes], Dict[str, Any]]]:
+    """
+    Build a decoder that keeps only the document fields used for templates
+
+    Returns:
+        Callable or None: Decoder function, or None if msgspec is not installed
+    """
+    if msgspec is None:
+        return None
+
+    # Fields absent from the response are dropped rather than set to None
+    document_type = msgspec.defstruct(
+        "LatitudeDocument",
+        [(field, Any, msgspec.UNSET) for field in TEMPLATE_SOURCE_FIELDS],
+    )
+    decoder = msgspec.json.Decoder(document_type)
+
+    def decode(content: bytes) -> Dict[str, Any]:
+        document = decoder.decode(content)
+        return {
+            field: value
+            for field in TEMPLATE_SOURCE_FIELDS
+            if (value := getattr(document, field)) is not msgspec.UNSET
+        }
+
+    return decode
+
+
+_decode_template_fields = _build_template_fields_decoder()
+
 
 class LatitudeClient:
     """Client for interacting with Latitude API v3"""
 
+    __slots__ = ("api_key", "base_url", "_client")
+
     def __init__(self, api_key: str):
         """
         Initialize Latitude client
@@ -29,16 +99,55 @@ class LatitudeClient:
         self.api_key = api_key
         self.base_url = "https://gateway.latitude.so/api/v3"
 
+        # Keep a single client so repeated requests reuse pooled connections.
+        # HTTP/2 is negotiated via ALPN and falls back to HTTP/1.1; httpx
+        # advertises and transparently decodes every compression it supports.
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=10,
+                max_connections=20,
+                keepalive_expiry=30.0,
+            ),
+            http2=True,
+        )
+
+    def close(self) -> None:
+        """Close the underlying HTTP client and its connection pool"""
+        self._client.close()
+
+    def __enter__(self) -> "LatitudeClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def get_document(
-        self, project_id: str, version_uuid: str, document_path: str
+        self,
+        project_id: str,
+        version_uuid: str,
+        document_path: str,
+        template_fields_only: bool = False,
     ) -> Dict[str, Any]:
         """
         Get a specific document from Latitude
 
+        Documents served with an ETag are cached and revalidated with
+        If-None-Match, so an unchanged document is not downloaded again.
+        The cache always holds the full document.
+
         Args:
             project_id: Latitude project ID
             version_uuid: Version UUID
             document_path: Path to the document
+            template_fields_only: Return only the fields used to build an
+                LLM template, decoding just those when msgspec is installed
 
         Returns:
             dict: Document data from Latitude API
@@ -46,34 +155,396 @@ class LatitudeClient:
         Raises:
             LatitudeAPIError: If the request fails
         """
-        url = f"{self.base_url}/projects/{project_id}/versions/{version_uuid}/documents/{document_path}"
+        cache_file = _document_cache_file(
+            self.api_key, project_id, version_uuid, document_path
+        )
+        entry = _read_cache_entry(cache_file, dict)
+
+        with _translate_errors():
+            response = self._client.get(
+                _document_url(project_id, version_uuid, document_path),
+                headers=_revalidation_headers(entry),
+            )
+            if entry is not None and response.status_code == 304:
+                data = entry["body"]
+            elif template_fields_only and (
+                cache_file is None or not response.headers.get("ETag")
+            ):
+                # Nothing will be cached, so only the template fields are decoded
+                return _parse_document_response(
+                    response, document_path, template_fields_only=True
+                )
+            else:
+                data = _parse_document_response(response, document_path)
+                _cache_response(cache_file, response, data)
+
+        return _template_fields(data) if template_fields_only else data
+
+    def iter_documents(
+        self, project_id: str, version_uuid: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all documents in a Latitude version
+
+        When ijson is installed, documents are parsed and yielded as the
+        response streams in; otherwise the full response is read first.
+        Listings served with an ETag are cached and revalidated with
+        If-None-Match, so an unchanged version is not downloaded again.
+
+        Args:
+            project_id: Latitude project ID
+            version_uuid: Version UUID or 'live'
+
+        Yields:
+            dict: Document data from Latitude API
+
+        Raises:
+            LatitudeAPIError: If the request fails
+        """
+        cache_file = _document_cache_file(self.api_key, project_id, version_uuid)
+        entry = _read_cache_entry(cache_file, list)
+
+        with _translate_errors():
+            with self._client.stream(
+                "GET",
+                _documents_url(project_id, version_uuid),
+                headers=_revalidation_headers(entry),
+            ) as response:
+                if entry is not None and response.status_code == 304:
+                    yield from entry["body"]
+                    return
+                _check_response_status(response, f"Version not found: {version_uuid}")
+
+                etag = response.headers.get("ETag")
+                if cache_file is None or not etag:
+                    yield from _stream_documents(response)
+                    return
+
+                documents = []
+                for document in _stream_documents(response):
+                    documents.append(document)
+                    yield document
+                _write_cache_entry(cache_file, documents, etag)
+
+    def list_documents(
+        self, project_id: str, version_uuid: str
+    ) -> List[Dict[str, Any]]:
+        """
+        List all documents in a Latitude version
+
+        Args:
+            project_id: Latitude project ID
+            version_uuid: Version UUID or 'live'
+
+        Returns:
+            list: Document data from Latitude API
+
+        Raises:
+            LatitudeAPIError: If the request fails
+        """
+        return list(self.iter_documents(project_id, version_uuid))
+
+    def get_documents(
+        self,
+        project_id: str,
+        version_uuid: str,
+        document_paths: List[str],
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get several documents from Latitude concurrently
+
+        Must not be called from inside a running event loop; await
+        get_documents_async() there instead.
+
+        Args:
+            project_id: Latitude project ID
+            version_uuid: Version UUID
+            document_paths: Paths of the documents to fetch
+            max_concurrency: Maximum number of requests in flight at once
+
+        Returns:
+            list: Document data from Latitude API, in the same order as
+                document_paths
+
+        Raises:
+            ValueError: If max_concurrency is less than 1
+            LatitudeAPIError: If any request fails
+        """
+        return asyncio.run(
+            self.get_documents_async(
+                project_id, version_uuid, document_paths, max_concurrency
+            )
+        )
+
+    async def get_documents_async(
+        self,
+        project_id: str,
+        version_uuid: str,
+        document_paths: List[str],
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get several documents from Latitude concurrently (async version)
+
+        Meant to be awaited from an application's own event loop. Cache
+        reads and writes run in worker threads so they don't block it, and
+        no tasks outlive the call: if any request fails, the others are
+        cancelled and awaited before the error is raised.
+
+        Args:
+            project_id: Latitude project ID
+            version_uuid: Version UUID
+            document_paths: Paths of the documents to fetch
+            max_concurrency: Maximum number of requests in flight at once
+
+        Returns:
+            list: Document data from Latitude API, in the same order as
+                document_paths
+
+        Raises:
+            ValueError: If max_concurrency is less than 1
+            LatitudeAPIError: If any request fails; the remaining requests
+                are cancelled before it is raised
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        with _translate_errors():
+            async with httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._client.headers,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=max_concurrency),
+                http2=True,
+            ) as client:
+
+                async def fetch(document_path: str) -> Dict[str, Any]:
+                    cache_file = _document_cache_file(
+                        self.api_key, project_id, version_uuid, document_path
+                    )
+                    # Disk I/O runs in a worker thread so other tasks keep going
+                    entry = None
+                    if cache_file is not None:
+                        entry = await asyncio.to_thread(
+                            _read_cache_entry, cache_file, dict
+                        )
+
+                    async with semaphore:
+                        response = await client.get(
+                            _document_url(project_id, version_uuid, document_path),
+                            headers=_revalidation_headers(entry),
+                        )
+                    if entry is not None and response.status_code == 304:
+                        cached: Dict[str, Any] = entry["body"]
+                        return cached
+                    data = _parse_document_response(response, document_path)
+
+                    if cache_file is not None:
+                        await asyncio.to_thread(
+                            _cache_response, cache_file, response, data
+                        )
+                    return data
+
+                tasks = [asyncio.ensure_future(fetch(path)) for path in document_paths]
+                try:
+                    return list(await asyncio.gather(*tasks))
+                except BaseException:
+                    # Stop sibling fetches before the client closes underneath them
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    raise
+
+
+def _documents_url(project_id: str, version_uuid: str) -> str:
+    """Build a version's document listing URL relative to the client's base URL"""
+    return f"/projects/{project_id}/versions/{version_uuid}/documents"
+
+
+def _document_url(project_id: str, version_uuid: str, document_path: str) -> str:
+    """Build a document URL relative to the client's base URL"""
+    return f"/projects/{project_id}/versions/{version_uuid}/documents/{document_path}"
+
+
+def _check_response_status(response: httpx.Response, not_found_message: str) -> None:
+    """
+    Raise the matching Latitude exception for an error response
+
+    Args:
+        response: HTTP response from the Latitude API
+        not_found_message: Message for the error raised on a 404
+
+    Raises:
+        LatitudeAuthenticationError: If the API key is rejected
+        LatitudeNotFoundError: If the resource does not exist
+        httpx.HTTPStatusError: For any other error status
+    """
+    if response.status_code == 401:
+        raise LatitudeAuthenticationError("Invalid Latitude API key")
+    elif response.status_code == 404:
+        raise LatitudeNotFoundError(not_found_message)
+
+    response.raise_for_status()
+
+
+def _parse_document_response(
+    response: httpx.Response, document_path: str, template_fields_only: bool = False
+) -> Dict[str, Any]:
+    """
+    Check the status of a document response and decode its body
+
+    Args:
+        response: HTTP response from the Latitude API
+        document_path: Requested document path, used in error messages
+        template_fields_only: Keep only the fields used to build an LLM template
+
+    Returns:
+        dict: Decoded document data
+
+    Raises:
+        LatitudeAuthenticationError: If the API key is rejected
+        LatitudeNotFoundError: If the document does not exist
+        httpx.HTTPStatusError: For any other error status
+    """
+    _check_response_status(response, f"Document not found: {document_path}")
+    if template_fields_only and _decode_template_fields is not None:
+        return _decode_template_fields(response.content)
+
+    document: Dict[str, Any] = _loads(response.content)
+    return _template_fields(document) if template_fields_only else document
+
+
+def _template_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the document fields used to build an LLM template"""
+    return {
+        field: document[field] for field in TEMPLATE_SOURCE_FIELDS if field in document
+    }
+
+
+def _stream_documents(response: httpx.Response) -> Iterator[Dict[str, Any]]:
+    """Yield the documents of a listing response, streaming if ijson is installed"""
+    if ijson is None:
+        response.read()
+        yield from _loads(response.content)
+        return
+
+    documents = ijson.sendable_list()
+    parser = ijson.items_coro(documents, "item", use_float=True)
+    for chunk in response.iter_bytes():
+        parser.send(chunk)
+        yield from documents
+        del documents[:]
+    parser.close()
+    yield from documents
+
+
+def _document_cache_file(
+    api_key: str,
+    project_id: str,
+    version_uuid: str,
+    document_path: Optional[str] = None,
+) -> Optional[Path]:
+    """
+    Get the on-disk cache file for a document, or for a version's listing
+
+    The API key is part of the hashed cache key, so entries are never shared
+    between keys. Caching is opt-in: set LATITUDE_TEMPLATE_CACHE=1 to enable it.
+
+    Args:
+        api_key: Latitude API key the entry is fetched with
+        project_id: Latitude project ID
+        version_uuid: Version UUID or 'live'
+        document_path: Path to the document, or None for the listing
+
+    Returns:
+        Path or None: Cache file location, or None if caching is disabled
+    """
+    if os.environ.get("LATITUDE_TEMPLATE_CACHE") != "1":
+        return None
+
+    cache_root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    cache_key = f"{api_key}\n{project_id}/{version_uuid}/"
+    if document_path is not None:
+        cache_key += document_path
+    key = hashlib.sha256(cache_key.encode()).hexdigest()
+    return Path(cache_root) / "llm-templates-latitude" / f"{key}.json"
+
+
+def _read_cache_entry(
+    cache_file: Optional[Path], body_type: type
+) -> Optional[Dict[str, Any]]:
+    """
+    Read a cache entry, returning None on a miss or unreadable entry
+
+    Args:
+        cache_file: Cache file location, or None if caching is disabled
+        body_type: Expected type of the cached response body
+
+    Returns:
+        dict or None: Entry with "etag" and "body" keys
+    """
+    if cache_file is None:
+        return None
+    try:
+        entry = _loads(cache_file.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or not isinstance(entry.get("body"), body_type):
+        return None
+    if not isinstance(entry.get("etag"), str):
+        return None
+    return entry
+
+
+def _write_cache_entry(cache_file: Path, body: Any, etag: Optional[str]) -> None:
+    """Atomically write a cache entry, ignoring filesystem errors"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_bytes(_dumps({"etag": etag, "body": body}))
+        tmp_file.replace(cache_file)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _cache_response(
+    cache_file: Optional[Path], response: httpx.Response, body: Any
+) -> None:
+    """
+    Cache a decoded response body if it can be revalidated later
+
+    Even versions requested by UUID may be drafts that are still being
+    edited, so only responses that carry an ETag are cached.
+    """
+    etag = response.headers.get("ETag")
+    if cache_file is not None and etag:
+        _write_cache_entry(cache_file, body, etag)
+
+
+def _revalidation_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Build If-None-Match headers to revalidate a cache entry, if there is one"""
+    if entry is not None:
+        return {"If-None-Match": entry["etag"]}
+    return {}
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
 
-        try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(url, headers=headers)
-
-                if response.status_code == 401:
-                    raise LatitudeAuthenticationError("Invalid Latitude API key")
-                elif response.status_code == 404:
-                    raise LatitudeNotFoundError(f"Document not found: {document_path}")
-
-                response.raise_for_status()
-                return response.json()
-
-        except (LatitudeAuthenticationError, LatitudeNotFoundError):
-            # Re-raise these as-is
-            raise
-        except httpx.HTTPStatusError as e:
-            raise LatitudeAPIError(f"Latitude API error: {e.response.status_code}")
-        except httpx.RequestError as e:
-            raise LatitudeAPIError(f"Failed to connect to Latitude API: {e}")
-        except Exception as e:
-            raise LatitudeAPIError(f"Error loading document from Latitude: {e}")
+@contextmanager
+def _translate_errors() -> Iterator[None]:
+    """Translate httpx and decoding errors into Latitude exceptions"""
+    try:
+        yield
+    except (LatitudeAuthenticationError, LatitudeNotFoundError):
+        # Re-raise these as-is
+        raise
+    except httpx.HTTPStatusError as e:
+        raise LatitudeAPIError(f"Latitude API error: {e.response.status_code}")
+    except httpx.RequestError as e:
+        raise LatitudeAPIError(f"Failed to connect to Latitude API: {e}")
+    except Exception as e:
+        raise LatitudeAPIError(f"Error loading document from Latitude: {e}")
 
 
 # All utility functions have been moved to utils.py and are imported at the top
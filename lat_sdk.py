@@ -23,20 +23,34 @@ from utils import (
 class LatitudeClient:
     """Client for interacting with Latitude using official SDK"""
 
-    def __init__(self, api_key: str, project_id: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: str,
+        project_id: Optional[str] = None,
+        version_uuid: Optional[str] = None,
+    ):
         """
         Initialize Latitude SDK client
 
         Args:
             api_key: Latitude API key
             project_id: Optional project ID for SDK initialization
+            version_uuid: Optional version UUID for SDK initialization; only
+                used together with project_id
         """
         self.api_key = api_key
         self.current_project_id = project_id
         self.current_version_uuid = None
 
-        # Initialize SDK with project ID if provided
-        if project_id:
+        # Initialize SDK with project (and version) context if provided, so
+        # the first get_document for that context doesn't rebuild the SDK
+        if project_id and version_uuid:
+            self.sdk = Latitude(
+                api_key,
+                LatitudeOptions(project_id=int(project_id), version_uuid=version_uuid),
+            )
+            self.current_version_uuid = version_uuid
+        elif project_id:
             self.sdk = Latitude(api_key, LatitudeOptions(project_id=int(project_id)))
         else:
             self.sdk = Latitude(api_key)
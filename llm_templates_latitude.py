@@ -2,13 +2,15 @@
 LLM template loader for Latitude - Load prompts from Latitude as LLM templates
 """
 
+import atexit
+import functools
 import os
+from typing import Any, Dict
 
 import llm
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# HTTP clients cached per API key so repeated loads share a connection pool
+_http_clients: Dict[str, Any] = {}
 
 
 def lat_loader(template_path: str) -> llm.Template:
@@ -99,6 +101,9 @@ def latitude_template_loader(template_path: str, use_sdk: bool = False) -> llm.T
 
         # Import utilities first
         from utils import (
+            LatitudeAPIError,
+            LatitudeAuthenticationError,
+            LatitudeNotFoundError,
             extract_template_data,
             parse_template_path,
         )
@@ -122,27 +127,33 @@ def latitude_template_loader(template_path: str, use_sdk: bool = False) -> llm.T
         if version_uuid is None:
             raise ValueError("Version UUID cannot be None")
 
-        # Load template from appropriate client
-        if use_sdk:
-            try:
-                from lat_sdk import LatitudeClient as SDKLatitudeClient
-
-                # For SDK, we can pass project_id during initialization if available
-                sdk_client = SDKLatitudeClient(api_key, project_id)
-                latitude_data = sdk_client.get_document(
-                    project_id, version_uuid, document_path
-                )
-            except ImportError:
-                raise ValueError(
-                    "SDK not available. Install with: pip install latitude-sdk"
+        # Load template from appropriate client; the Latitude exception
+        # classes are only bound once the utils import above has succeeded
+        try:
+            if use_sdk:
+                try:
+                    from lat_sdk import LatitudeClient as SDKLatitudeClient
+
+                    # Pass the parsed context so the SDK is only initialized once
+                    sdk_client = SDKLatitudeClient(api_key, project_id, version_uuid)
+                    latitude_data = sdk_client.get_document(
+                        project_id, version_uuid, document_path
+                    )
+                except ImportError:
+                    raise ValueError(
+                        "SDK not available. Install with: pip install latitude-sdk"
+                    )
+            else:
+                http_client = _get_http_client(api_key)
+                latitude_data = http_client.get_document(
+                    project_id, version_uuid, document_path, template_fields_only=True
                 )
-        else:
-            from lat import LatitudeClient as HTTPLatitudeClient
-
-            http_client = HTTPLatitudeClient(api_key)
-            latitude_data = http_client.get_document(
-                project_id, version_uuid, document_path
-            )
+        except LatitudeAuthenticationError as e:
+            raise ValueError(f"Authentication error: {e}")
+        except LatitudeNotFoundError as e:
+            raise ValueError(f"Not found: {e}")
+        except LatitudeAPIError as e:
+            raise ValueError(f"Latitude API error: {e}")
 
         # Extract template configuration
         template_config = extract_template_data(latitude_data)
@@ -155,32 +166,32 @@ def latitude_template_loader(template_path: str, use_sdk: bool = False) -> llm.T
         # Re-raise ValueError (like "SDK not available") as-is
         raise
     except Exception as e:
-        # Handle Latitude-specific errors if the exception classes are defined
-        error_name = type(e).__name__
-        if "Authentication" in error_name:
-            raise ValueError(f"Authentication error: {e}")
-        elif "NotFound" in error_name:
-            raise ValueError(f"Not found: {e}")
-        elif "LatitudeAPI" in error_name:
-            raise ValueError(f"Latitude API error: {e}")
-        else:
-            raise ValueError(f"Error loading template: {e}")
+        raise ValueError(f"Error loading template: {e}")
 
 
+@functools.lru_cache(maxsize=1)
 def _get_api_key() -> str:
-    """Get Latitude API key from environment variables or LLM keys"""
-    # Try environment variable first
+    """
+    Get Latitude API key from environment variables or LLM keys
+
+    The resolved key is cached for the life of the process; call
+    reset_api_key_cache() to force a fresh lookup.
+    """
+    # Try environment variable first, falling back to a .env file only if unset
     api_key = os.getenv("LATITUDE_API_KEY")
+    if not api_key:
+        _load_dotenv()
+        api_key = os.getenv("LATITUDE_API_KEY")
     if api_key:
         return api_key
 
-    # Try LLM keys system
+    # Try LLM keys system, guarding only the lookup itself
     try:
         api_key = llm.get_key("", "latitude", "LATITUDE_API_KEY")
-        if api_key:
-            return api_key
     except Exception:
-        pass
+        api_key = None
+    if api_key:
+        return api_key
 
     raise ValueError(
         "Latitude API key not found. Set LATITUDE_API_KEY environment variable "
@@ -188,6 +199,42 @@ def _get_api_key() -> str:
     )
 
 
+@functools.lru_cache(maxsize=1)
+def _load_dotenv() -> None:
+    """Load a .env file into the environment, at most once per process"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def _get_http_client(api_key: str) -> Any:
+    """Get a cached HTTP client for the given API key, creating it if needed"""
+    client = _http_clients.get(api_key)
+    if client is None:
+        from lat import LatitudeClient as HTTPLatitudeClient
+
+        client = _http_clients[api_key] = HTTPLatitudeClient(api_key)
+    return client
+
+
+def reset_api_key_cache() -> None:
+    """
+    Forget the cached API key so the next load looks it up again
+
+    HTTP clients cached for the previous key are closed and dropped too.
+    """
+    _get_api_key.cache_clear()
+    _close_http_clients()
+
+
+@atexit.register
+def _close_http_clients() -> None:
+    """Close cached HTTP clients and their connection pools"""
+    while _http_clients:
+        _, client = _http_clients.popitem()
+        client.close()
+
+
 def get_client_implementation(template_name: str = "lat") -> str:
     """
     Get the client implementation for a given template name
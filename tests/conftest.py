@@ -0,0 +1,32 @@
+"""Shared pytest configuration for llm-templates-latitude tests"""
+
+import pytest
+
+import llm_templates_latitude
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Point the on-disk document cache at a per-test directory, disabled"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.delenv("LATITUDE_TEMPLATE_CACHE", raising=False)
+    return tmp_path / "cache" / "llm-templates-latitude"
+
+
+@pytest.fixture
+def template_cache_dir(isolated_cache_dir, monkeypatch):
+    """Opt in to the on-disk document cache for a test"""
+    monkeypatch.setenv("LATITUDE_TEMPLATE_CACHE", "1")
+    return isolated_cache_dir
+
+
+@pytest.fixture(autouse=True)
+def reset_module_caches():
+    """Reset module-level caches so tests don't leak clients between each other"""
+    llm_templates_latitude._http_clients.clear()
+    llm_templates_latitude.reset_api_key_cache()
+    llm_templates_latitude._load_dotenv.cache_clear()
+    yield
+    llm_templates_latitude._http_clients.clear()
+    llm_templates_latitude.reset_api_key_cache()
+    llm_templates_latitude._load_dotenv.cache_clear()
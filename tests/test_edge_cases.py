@@ -41,6 +41,13 @@ class TestPathParsingEdgeCases:
         assert project_id == "12345"
         assert doc_path == long_path
 
+    def test_parse_template_path_version_only(self):
+        """Test a bare version UUID parses with an empty document path"""
+        project_id, version_uuid, doc_path = parse_template_path(SAMPLE_UUIDS[0])
+        assert project_id is None
+        assert version_uuid == SAMPLE_UUIDS[0]
+        assert doc_path == ""
+
     def test_is_uuid_like_edge_cases(self):
         """Test UUID detection edge cases"""
         # Valid UUIDs with different cases
@@ -59,6 +66,15 @@ class TestPathParsingEdgeCases:
         assert (
             is_uuid_like("g50e8400-e29b-41d4-a716-446655440000") is False
         )  # Invalid char
+        assert (
+            is_uuid_like("550e8400-e29b-41d4-a716-446655440000\n") is False
+        )  # Trailing newline
+        assert (
+            is_uuid_like("+50e8400-e29b-41d4-a716-446655440000") is False
+        )  # Sign accepted by int(..., 16)
+        assert (
+            is_uuid_like("550e8400-e29b-41d4-a716-4466_5440000") is False
+        )  # Underscore accepted by int(..., 16)
 
         # "live" is not a UUID but should be handled separately
         assert is_uuid_like("live") is False
@@ -264,6 +280,15 @@ class TestErrorRecovery:
                 or result.get("prompt") == ""
             )
 
+    def test_null_content_falls_back_to_prompt(self):
+        """Test that an explicit null content does not hide the prompt field"""
+        result = extract_template_data({"content": None, "prompt": "Fallback"})
+        assert result["prompt"] == "Fallback"
+
+        # An empty string is real content and is not replaced
+        result = extract_template_data({"content": "", "prompt": "Fallback"})
+        assert result["prompt"] == ""
+
     def test_malformed_data_structures(self):
         """Test with malformed data structures"""
         test_cases = [
@@ -294,8 +319,7 @@ class TestHTTPClientEdgeCases:
         """Test handling of request timeouts"""
         import httpx
 
-        mock_client = Mock()
-        mock_client_class.return_value.__enter__.return_value = mock_client
+        mock_client = mock_client_class.return_value
         mock_client.get.side_effect = httpx.TimeoutException("Request timed out")
 
         client = LatitudeClient("test-key")
@@ -313,11 +337,10 @@ class TestHTTPClientEdgeCases:
         """Test handling of invalid JSON responses"""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.side_effect = ValueError("Invalid JSON")
-        mock_response.text = "Not valid JSON"
+        mock_response.headers = {}
+        mock_response.content = b"Not valid JSON"
 
-        mock_client = Mock()
-        mock_client_class.return_value.__enter__.return_value = mock_client
+        mock_client = mock_client_class.return_value
         mock_client.get.return_value = mock_response
 
         client = LatitudeClient("test-key")
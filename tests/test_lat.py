@@ -1,9 +1,13 @@
 """Tests for lat.py module"""
 
+import asyncio
+import threading
 from unittest.mock import Mock, patch
 
+import httpx
 import pytest
 
+import lat
 from lat import LatitudeClient
 from utils import (
     LatitudeAuthenticationError,
@@ -14,22 +18,29 @@ from utils import (
 )
 
 
+def _mock_client(client_class, handler):
+    """Build an httpx client factory that routes requests to a mock handler"""
+
+    def factory(**kwargs):
+        return client_class(transport=httpx.MockTransport(handler), **kwargs)
+
+    return factory
+
+
 @patch("lat.httpx.Client")
 def test_latitude_client_get_document_success(mock_httpx_client):
     """Test successful document retrieval"""
     # Setup mock
     mock_response = Mock()
     mock_response.status_code = 200
-    mock_response.json.return_value = {
-        "content": "Test prompt content",
-        "system": "Test system prompt",
-    }
+    mock_response.headers = {}
+    mock_response.content = (
+        b'{"content": "Test prompt content", "system": "Test system prompt"}'
+    )
     mock_response.raise_for_status.return_value = None
 
-    mock_client = Mock()
+    mock_client = mock_httpx_client.return_value
     mock_client.get.return_value = mock_response
-    mock_httpx_client.return_value.__enter__ = Mock(return_value=mock_client)
-    mock_httpx_client.return_value.__exit__ = Mock(return_value=None)
 
     # Test
     client = LatitudeClient("test-api-key")
@@ -41,13 +52,111 @@ def test_latitude_client_get_document_success(mock_httpx_client):
     assert result["content"] == "Test prompt content"
     assert result["system"] == "Test system prompt"
 
-    # Verify API call
-    mock_client.get.assert_called_once()
-    call_args = mock_client.get.call_args
-    assert "project123" in call_args[0][0]
-    assert "550e8400-e29b-41d4-a716-446655440000" in call_args[0][0]
-    assert "test-doc" in call_args[0][0]
-    assert call_args[1]["headers"]["Authorization"] == "Bearer test-api-key"
+    # Verify API call uses a path relative to the client's base_url
+    mock_client.get.assert_called_once_with(
+        "/projects/project123/versions/550e8400-e29b-41d4-a716-446655440000"
+        "/documents/test-doc",
+        headers={},
+    )
+
+    # Verify auth header is configured once on the shared client
+    client_kwargs = mock_httpx_client.call_args[1]
+    assert client_kwargs["headers"]["Authorization"] == "Bearer test-api-key"
+    assert client_kwargs["headers"]["Accept"] == "application/json"
+    assert client_kwargs["base_url"] == "https://gateway.latitude.so/api/v3"
+    assert client_kwargs["http2"] is True
+
+
+@pytest.mark.parametrize("use_msgspec", [True, False])
+@patch("lat.httpx.Client")
+def test_latitude_client_template_fields_only(
+    mock_httpx_client, monkeypatch, use_msgspec
+):
+    """Test that documents are full unless template fields are requested"""
+    if use_msgspec:
+        pytest.importorskip("msgspec")
+    else:
+        monkeypatch.setattr("lat._decode_template_fields", None)
+
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.headers = {}
+    mock_response.content = (
+        b'{"uuid": "abc", "path": "test-doc", "content": null,'
+        b' "prompt": "Fallback", "config": {"provider": "openai"}}'
+    )
+    mock_httpx_client.return_value.get.return_value = mock_response
+
+    client = LatitudeClient("test-api-key")
+    version_uuid = "550e8400-e29b-41d4-a716-446655440000"
+    full = client.get_document("project123", version_uuid, "test-doc")
+    pruned = client.get_document(
+        "project123", version_uuid, "test-doc", template_fields_only=True
+    )
+
+    assert full["uuid"] == "abc"
+    assert full["config"] == {"provider": "openai"}
+    # Explicit nulls are kept as sent; absent fields are left out
+    assert pruned == {"content": None, "prompt": "Fallback"}
+
+
+@pytest.mark.parametrize(
+    "response_headers, cache_setting",
+    [({}, "1"), ({"ETag": '"v1"'}, None)],
+)
+@patch("lat.httpx.Client")
+def test_latitude_client_skips_cache(
+    mock_httpx_client, monkeypatch, isolated_cache_dir, response_headers, cache_setting
+):
+    """Test that the cache is opt-in and skips responses without an ETag"""
+    if cache_setting is not None:
+        monkeypatch.setenv("LATITUDE_TEMPLATE_CACHE", cache_setting)
+
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.headers = response_headers
+    mock_response.content = b'{"content": "Fresh prompt"}'
+    mock_client = mock_httpx_client.return_value
+    mock_client.get.return_value = mock_response
+
+    client = LatitudeClient("test-api-key")
+    for _ in range(2):
+        client.get_document(
+            "project123", "550e8400-e29b-41d4-a716-446655440000", "test-doc"
+        )
+
+    assert mock_client.get.call_count == 2
+    assert not isolated_cache_dir.exists()
+
+
+@patch("lat.httpx.Client")
+def test_latitude_client_reuses_http_client(mock_httpx_client):
+    """Test that multiple requests share a single HTTP client"""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.headers = {}
+    mock_response.content = b'{"content": "Test prompt content"}'
+
+    mock_client = mock_httpx_client.return_value
+    mock_client.get.return_value = mock_response
+
+    client = LatitudeClient("test-api-key")
+    for document_path in ["doc-a", "doc-b", "doc-c"]:
+        client.get_document(
+            "project123", "550e8400-e29b-41d4-a716-446655440000", document_path
+        )
+
+    mock_httpx_client.assert_called_once()
+    assert mock_client.get.call_count == 3
+
+
+@patch("lat.httpx.Client")
+def test_latitude_client_context_manager_closes(mock_httpx_client):
+    """Test that the context manager closes the HTTP client"""
+    with LatitudeClient("test-api-key") as client:
+        assert isinstance(client, LatitudeClient)
+
+    mock_httpx_client.return_value.close.assert_called_once()
 
 
 @patch("lat.httpx.Client")
@@ -57,10 +166,8 @@ def test_latitude_client_authentication_error(mock_httpx_client):
     mock_response = Mock()
     mock_response.status_code = 401
 
-    mock_client = Mock()
+    mock_client = mock_httpx_client.return_value
     mock_client.get.return_value = mock_response
-    mock_httpx_client.return_value.__enter__ = Mock(return_value=mock_client)
-    mock_httpx_client.return_value.__exit__ = Mock(return_value=None)
 
     # Test
     client = LatitudeClient("invalid-key")
@@ -78,10 +185,8 @@ def test_latitude_client_not_found_error(mock_httpx_client):
     mock_response = Mock()
     mock_response.status_code = 404
 
-    mock_client = Mock()
+    mock_client = mock_httpx_client.return_value
     mock_client.get.return_value = mock_response
-    mock_httpx_client.return_value.__enter__ = Mock(return_value=mock_client)
-    mock_httpx_client.return_value.__exit__ = Mock(return_value=None)
 
     # Test
     client = LatitudeClient("test-api-key")
@@ -114,6 +219,10 @@ def test_parse_template_path_valid_formats():
 def test_parse_template_path_invalid_formats():
     """Test parsing invalid template path formats"""
 
+    # Empty path
+    with pytest.raises(ValueError, match="Template path cannot be empty"):
+        parse_template_path("")
+
     # Invalid single part (not UUID)
     with pytest.raises(ValueError, match="Invalid format"):
         parse_template_path("not-a-uuid")
@@ -188,3 +297,366 @@ def test_extract_template_data():
     assert config["prompt"] == "Just content"
     assert "system" not in config
     assert "model" not in config
+
+
+def test_latitude_client_get_documents_concurrent():
+    """Test fetching several documents concurrently keeps request order"""
+    requested = []
+
+    def handler(request):
+        requested.append(request)
+        name = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"content": f"Prompt {name}"})
+
+    with patch(
+        "lat.httpx.AsyncClient", side_effect=_mock_client(httpx.AsyncClient, handler)
+    ):
+        client = LatitudeClient("test-api-key")
+        results = client.get_documents(
+            "project123",
+            "550e8400-e29b-41d4-a716-446655440000",
+            ["doc-a", "doc-b", "doc-c"],
+        )
+
+    assert [r["content"] for r in results] == [
+        "Prompt doc-a",
+        "Prompt doc-b",
+        "Prompt doc-c",
+    ]
+    assert len(requested) == 3
+    assert all(r.headers["Authorization"] == "Bearer test-api-key" for r in requested)
+    assert str(requested[0].url) == (
+        "https://gateway.latitude.so/api/v3/projects/project123/versions/"
+        "550e8400-e29b-41d4-a716-446655440000/documents/doc-a"
+    )
+
+
+def test_latitude_client_get_documents_uses_cache(template_cache_dir):
+    """Test that bulk fetches revalidate and fill the on-disk document cache"""
+    requested = []
+
+    def handler(request):
+        requested.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"content": "Prompt"}, headers={"ETag": '"v1"'})
+
+    version_uuid = "550e8400-e29b-41d4-a716-446655440000"
+    with patch(
+        "lat.httpx.AsyncClient", side_effect=_mock_client(httpx.AsyncClient, handler)
+    ):
+        client = LatitudeClient("test-api-key")
+        client.get_documents("project123", version_uuid, ["doc-a"])
+        results = client.get_documents("project123", version_uuid, ["doc-a", "doc-b"])
+
+    assert results == [{"content": "Prompt"}, {"content": "Prompt"}]
+    revalidated = {
+        r.url.path.rsplit("/", 1)[-1]: r.headers.get("If-None-Match")
+        for r in requested[1:]
+    }
+    assert revalidated == {"doc-a": '"v1"', "doc-b": None}
+    assert len(list(template_cache_dir.glob("*.json"))) == 2
+
+
+def test_latitude_client_get_documents_cache_io_off_loop(template_cache_dir):
+    """Test that bulk fetches do their cache disk I/O off the event loop"""
+    io_threads = []
+    real_read, real_write = lat._read_cache_entry, lat._write_cache_entry
+
+    def read(*args):
+        io_threads.append(threading.get_ident())
+        return real_read(*args)
+
+    def write(*args):
+        io_threads.append(threading.get_ident())
+        real_write(*args)
+
+    def handler(request):
+        return httpx.Response(200, json={"content": "Prompt"}, headers={"ETag": '"v1"'})
+
+    with patch.multiple("lat", _read_cache_entry=read, _write_cache_entry=write):
+        with patch(
+            "lat.httpx.AsyncClient",
+            side_effect=_mock_client(httpx.AsyncClient, handler),
+        ):
+            client = LatitudeClient("test-api-key")
+            client.get_documents(
+                "project123", "550e8400-e29b-41d4-a716-446655440000", ["doc-a"]
+            )
+
+    assert len(io_threads) == 2
+    assert threading.get_ident() not in io_threads
+    assert len(list(template_cache_dir.glob("*.json"))) == 1
+
+
+def test_latitude_client_get_documents_async():
+    """Test awaiting the bulk fetch from inside a running event loop"""
+
+    def handler(request):
+        return httpx.Response(200, json={"content": "Prompt"})
+
+    async def load():
+        return await client.get_documents_async(
+            "project123", "550e8400-e29b-41d4-a716-446655440000", ["doc-a", "doc-b"]
+        )
+
+    with patch(
+        "lat.httpx.AsyncClient", side_effect=_mock_client(httpx.AsyncClient, handler)
+    ):
+        client = LatitudeClient("test-api-key")
+        results = asyncio.run(load())
+
+    assert results == [{"content": "Prompt"}, {"content": "Prompt"}]
+
+
+def test_latitude_client_get_documents_not_found():
+    """Test that a missing document fails the whole batch"""
+
+    def handler(request):
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404)
+        return httpx.Response(200, json={"content": "Prompt"})
+
+    with patch(
+        "lat.httpx.AsyncClient", side_effect=_mock_client(httpx.AsyncClient, handler)
+    ):
+        client = LatitudeClient("test-api-key")
+        with pytest.raises(LatitudeNotFoundError, match="missing"):
+            client.get_documents(
+                "project123",
+                "550e8400-e29b-41d4-a716-446655440000",
+                ["doc-a", "missing"],
+            )
+
+
+@pytest.mark.parametrize("max_concurrency", [0, -1])
+def test_latitude_client_get_documents_rejects_bad_concurrency(max_concurrency):
+    """Test that a max_concurrency below 1 fails fast instead of hanging"""
+    client = LatitudeClient("test-api-key")
+
+    with pytest.raises(ValueError, match="max_concurrency must be >= 1"):
+        client.get_documents(
+            "project123",
+            "550e8400-e29b-41d4-a716-446655440000",
+            ["doc-a"],
+            max_concurrency=max_concurrency,
+        )
+
+
+def test_latitude_client_get_documents_cancels_on_failure():
+    """Test that a failed fetch cancels the rest of the batch before raising"""
+    cancelled = []
+
+    async def handler(request):
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(request.url.path.rsplit("/", 1)[-1])
+            raise
+        return httpx.Response(200, json={"content": "Prompt"})
+
+    async def load():
+        with pytest.raises(LatitudeNotFoundError):
+            await client.get_documents_async(
+                "project123",
+                "550e8400-e29b-41d4-a716-446655440000",
+                ["slow-a", "missing", "slow-b"],
+            )
+        return list(cancelled)
+
+    with patch(
+        "lat.httpx.AsyncClient", side_effect=_mock_client(httpx.AsyncClient, handler)
+    ):
+        client = LatitudeClient("test-api-key")
+        assert sorted(asyncio.run(load())) == ["slow-a", "slow-b"]
+
+
+def test_latitude_client_get_documents_async_leaves_no_tasks():
+    """Test that a failed bulk fetch leaves no tasks in the caller's loop"""
+
+    async def handler(request):
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404)
+        await asyncio.sleep(10)
+        return httpx.Response(200, json={"content": "Prompt"})
+
+    async def load():
+        with pytest.raises(LatitudeNotFoundError):
+            await client.get_documents_async(
+                "project123",
+                "550e8400-e29b-41d4-a716-446655440000",
+                ["slow-a", "missing", "slow-b"],
+            )
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    with patch(
+        "lat.httpx.AsyncClient", side_effect=_mock_client(httpx.AsyncClient, handler)
+    ):
+        client = LatitudeClient("test-api-key")
+        assert asyncio.run(load()) == set()
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_latitude_client_list_documents(monkeypatch, streaming):
+    """Test listing a version's documents with and without ijson streaming"""
+    if streaming:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr("lat.ijson", None)
+
+    def handler(request):
+        assert request.url.path == "/api/v3/projects/project123/versions/live/documents"
+        return httpx.Response(
+            200,
+            content=b'[{"path": "doc-a", "content": "A", "temperature": 0.5},'
+            b' {"path": "doc-b", "content": "B"}]',
+        )
+
+    with patch("lat.httpx.Client", side_effect=_mock_client(httpx.Client, handler)):
+        client = LatitudeClient("test-api-key")
+        documents = client.list_documents("project123", "live")
+
+    assert documents == [
+        {"path": "doc-a", "content": "A", "temperature": 0.5},
+        {"path": "doc-b", "content": "B"},
+    ]
+
+
+def test_latitude_client_decodes_brotli_response():
+    """Test that a Brotli-compressed document decodes through get_document"""
+    brotli = pytest.importorskip("brotli")
+
+    def handler(request):
+        return httpx.Response(
+            200,
+            content=brotli.compress(b'{"content": "Compressed prompt"}'),
+            headers={"Content-Encoding": "br"},
+        )
+
+    with patch("lat.httpx.Client", side_effect=_mock_client(httpx.Client, handler)):
+        client = LatitudeClient("test-api-key")
+        result = client.get_document(
+            "project123", "550e8400-e29b-41d4-a716-446655440000", "test-doc"
+        )
+
+    assert result == {"content": "Compressed prompt"}
+
+
+def test_latitude_client_iter_documents_version_not_found():
+    """Test that listing a missing version raises LatitudeNotFoundError"""
+
+    def handler(request):
+        return httpx.Response(404)
+
+    with patch("lat.httpx.Client", side_effect=_mock_client(httpx.Client, handler)):
+        client = LatitudeClient("test-api-key")
+        with pytest.raises(LatitudeNotFoundError, match="Version not found: live"):
+            list(client.iter_documents("project123", "live"))
+
+
+@pytest.mark.parametrize(
+    "version_uuid", ["live", "550e8400-e29b-41d4-a716-446655440000"]
+)
+def test_latitude_client_revalidates_cached_document(template_cache_dir, version_uuid):
+    """Test that cached documents are always revalidated with their ETag"""
+    requested = []
+
+    def handler(request):
+        requested.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"content": "Live"}, headers={"ETag": '"v1"'})
+
+    with patch("lat.httpx.Client", side_effect=_mock_client(httpx.Client, handler)):
+        client = LatitudeClient("test-api-key")
+        first = client.get_document("project123", version_uuid, "test-doc")
+        second = client.get_document("project123", version_uuid, "test-doc")
+
+    assert first == second == {"content": "Live"}
+    assert "If-None-Match" not in requested[0].headers
+    assert requested[1].headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_latitude_client_revalidates_document_listing(
+    monkeypatch, template_cache_dir, streaming
+):
+    """Test that a 304 on a listing replays the cached documents"""
+    if streaming:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr("lat.ijson", None)
+
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, json=[{"path": "doc-a", "content": "A"}], headers={"ETag": '"v1"'}
+        )
+
+    with patch("lat.httpx.Client", side_effect=_mock_client(httpx.Client, handler)):
+        client = LatitudeClient("test-api-key")
+        first = client.list_documents("project123", "live")
+        second = client.list_documents("project123", "live")
+
+    assert first == second == [{"path": "doc-a", "content": "A"}]
+    assert len(list(template_cache_dir.glob("*.json"))) == 1
+
+
+def test_latitude_client_cache_is_per_api_key(template_cache_dir):
+    """Test that cache entries are not reused across keys or past a 401"""
+    requested = []
+
+    def handler(request):
+        requested.append(request)
+        if request.headers["Authorization"] == "Bearer revoked-key":
+            return httpx.Response(401)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"content": "Doc"}, headers={"ETag": '"v1"'})
+
+    version_uuid = "550e8400-e29b-41d4-a716-446655440000"
+    with patch("lat.httpx.Client", side_effect=_mock_client(httpx.Client, handler)):
+        LatitudeClient("key-a").get_document("project123", version_uuid, "doc")
+        LatitudeClient("key-b").get_document("project123", version_uuid, "doc")
+
+        client = LatitudeClient("key-a")
+        assert client.get_document("project123", version_uuid, "doc") == {
+            "content": "Doc"
+        }
+        client._client.headers["Authorization"] = "Bearer revoked-key"
+        with pytest.raises(LatitudeAuthenticationError):
+            client.get_document("project123", version_uuid, "doc")
+
+    assert [r.headers.get("If-None-Match") for r in requested] == [
+        None,
+        None,
+        '"v1"',
+        '"v1"',
+    ]
+    assert len(list(template_cache_dir.glob("*.json"))) == 2
+
+
+def test_latitude_client_caches_full_document(template_cache_dir):
+    """Test that template-field requests still cache the full document"""
+
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            json={"uuid": "abc", "content": "Doc"},
+            headers={"ETag": '"v1"'},
+        )
+
+    with patch("lat.httpx.Client", side_effect=_mock_client(httpx.Client, handler)):
+        client = LatitudeClient("test-api-key")
+        pruned = client.get_document(
+            "project123", "live", "doc", template_fields_only=True
+        )
+        full = client.get_document("project123", "live", "doc")
+
+    assert pruned == {"content": "Doc"}
+    assert full == {"uuid": "abc", "content": "Doc"}
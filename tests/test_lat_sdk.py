@@ -200,6 +200,25 @@ class TestLatitudeSDKClient:
             project_id=67890, version_uuid="6ba7b810-9dad-11d1-80b4-00c04fd430c8"
         )
 
+    @patch("lat_sdk.asyncio.run")
+    @patch("lat_sdk.Latitude")
+    @patch("lat_sdk.LatitudeOptions")
+    def test_initial_version_context_avoids_reinit(
+        self, mock_options, mock_latitude_class, mock_asyncio_run
+    ):
+        """Test that passing the version up front initializes the SDK once"""
+        mock_asyncio_run.return_value = {"content": "Test"}
+
+        client = LatitudeClient(
+            "test-api-key", "12345", "550e8400-e29b-41d4-a716-446655440000"
+        )
+        client.get_document("12345", "550e8400-e29b-41d4-a716-446655440000", "test-doc")
+
+        mock_latitude_class.assert_called_once()
+        mock_options.assert_called_once_with(
+            project_id=12345, version_uuid="550e8400-e29b-41d4-a716-446655440000"
+        )
+
     @patch("lat_sdk.asyncio.run")
     @patch("lat_sdk.Latitude")
     @patch("lat_sdk.LatitudeOptions")
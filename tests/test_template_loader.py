@@ -134,6 +134,88 @@ def test_get_api_key_from_env(mock_getenv):
     mock_getenv.assert_called_with("LATITUDE_API_KEY")
 
 
+@patch("dotenv.load_dotenv")
+@patch("llm_templates_latitude.os.getenv")
+def test_get_api_key_skips_dotenv_when_env_set(mock_getenv, mock_load_dotenv):
+    """Test that .env is only loaded when the environment lacks the key"""
+    from llm_templates_latitude import _get_api_key
+
+    mock_getenv.return_value = "env-api-key"
+
+    assert _get_api_key() == "env-api-key"
+    mock_load_dotenv.assert_not_called()
+
+
+@patch("dotenv.load_dotenv")
+@patch("llm_templates_latitude.os.getenv")
+def test_get_api_key_from_dotenv(mock_getenv, mock_load_dotenv):
+    """Test falling back to a .env file when the environment lacks the key"""
+    from llm_templates_latitude import _get_api_key
+
+    mock_getenv.side_effect = [None, "dotenv-api-key"]
+
+    assert _get_api_key() == "dotenv-api-key"
+    mock_load_dotenv.assert_called_once()
+
+
+@patch("dotenv.load_dotenv")
+@patch("llm_templates_latitude.llm.get_key")
+@patch("llm_templates_latitude.os.getenv")
+def test_get_api_key_loads_dotenv_once(mock_getenv, mock_get_key, mock_load_dotenv):
+    """Test that failed lookups do not search for .env files again"""
+    from llm_templates_latitude import _get_api_key
+
+    mock_getenv.return_value = None
+    mock_get_key.return_value = None
+
+    for _ in range(3):
+        with pytest.raises(ValueError, match="Latitude API key not found"):
+            _get_api_key()
+
+    mock_load_dotenv.assert_called_once()
+
+
+@patch("llm_templates_latitude.os.getenv")
+def test_get_api_key_is_cached(mock_getenv):
+    """Test that the API key lookup only runs once per process"""
+    from llm_templates_latitude import _get_api_key
+
+    mock_getenv.return_value = "env-api-key"
+
+    assert _get_api_key() == "env-api-key"
+    assert _get_api_key() == "env-api-key"
+    mock_getenv.assert_called_once_with("LATITUDE_API_KEY")
+
+
+@patch("llm_templates_latitude.os.getenv")
+def test_reset_api_key_cache(mock_getenv):
+    """Test that resetting the cache picks up a rotated API key"""
+    from llm_templates_latitude import _get_api_key, reset_api_key_cache
+
+    mock_getenv.return_value = "old-api-key"
+    assert _get_api_key() == "old-api-key"
+
+    mock_getenv.return_value = "new-api-key"
+    assert _get_api_key() == "old-api-key"
+
+    reset_api_key_cache()
+    assert _get_api_key() == "new-api-key"
+
+
+def test_reset_api_key_cache_closes_http_clients():
+    """Test that resetting the key closes clients opened with the old one"""
+    import llm_templates_latitude
+    from llm_templates_latitude import reset_api_key_cache
+
+    old_client = Mock()
+    llm_templates_latitude._http_clients["old-api-key"] = old_client
+
+    reset_api_key_cache()
+
+    old_client.close.assert_called_once()
+    assert llm_templates_latitude._http_clients == {}
+
+
 @patch("llm_templates_latitude.llm.get_key")
 @patch("llm_templates_latitude.os.getenv")
 def test_get_api_key_missing(mock_getenv, mock_get_key):
@@ -147,6 +229,19 @@ def test_get_api_key_missing(mock_getenv, mock_get_key):
         _get_api_key()
 
 
+@patch("llm_templates_latitude.llm.get_key")
+@patch("llm_templates_latitude.os.getenv")
+def test_get_api_key_from_llm_keys(mock_getenv, mock_get_key):
+    """Test falling back to the LLM keys system when the env var is unset"""
+    from llm_templates_latitude import _get_api_key
+
+    mock_getenv.return_value = None
+    mock_get_key.return_value = "stored-api-key"
+
+    assert _get_api_key() == "stored-api-key"
+    mock_get_key.assert_called_once_with("", "latitude", "LATITUDE_API_KEY")
+
+
 class TestPrefixBasedSelection:
     """Test template prefix-based client selection functionality"""
 
@@ -185,6 +280,40 @@ class TestPrefixBasedSelection:
         mock_http_client.assert_called_once_with("test-api-key")
         assert template.prompt == "Test prompt"
 
+    @patch("llm_templates_latitude._get_api_key")
+    @patch("lat.LatitudeClient")
+    def test_latitude_template_loader_reuses_http_client(
+        self, mock_http_client, mock_get_api_key
+    ):
+        """Test that repeated loads with the same API key share one HTTP client"""
+        from llm_templates_latitude import latitude_template_loader
+
+        mock_get_api_key.return_value = "test-api-key"
+        mock_http_client.return_value.get_document.return_value = {
+            "content": "Test prompt"
+        }
+
+        for document_path in ["first", "second"]:
+            latitude_template_loader(
+                f"12345/550e8400-e29b-41d4-a716-446655440000/{document_path}",
+                use_sdk=False,
+            )
+
+        mock_http_client.assert_called_once_with("test-api-key")
+        assert mock_http_client.return_value.get_document.call_count == 2
+
+    def test_close_http_clients(self):
+        """Test that cached HTTP clients are closed and dropped"""
+        import llm_templates_latitude
+
+        cached_client = Mock()
+        llm_templates_latitude._http_clients["test-api-key"] = cached_client
+
+        llm_templates_latitude._close_http_clients()
+
+        cached_client.close.assert_called_once()
+        assert llm_templates_latitude._http_clients == {}
+
     @patch("llm_templates_latitude._get_api_key")
     def test_latitude_template_loader_sdk_not_available(self, mock_get_api_key):
         """Test that error is raised when SDK is requested but not available"""
@@ -306,6 +435,43 @@ class TestTemplateLoaderIntegration:
                 "12345/550e8400-e29b-41d4-a716-446655440000/missing-doc", use_sdk=False
             )
 
+    @pytest.mark.parametrize(
+        "error, message",
+        [
+            ("api", "Latitude API error: Server exploded"),
+            ("other", "Error loading template: Server exploded"),
+        ],
+    )
+    @patch("lat.LatitudeClient")
+    @patch("llm_templates_latitude._get_api_key")
+    def test_latitude_template_loader_generic_errors(
+        self, mock_get_api_key, mock_client_class, error, message
+    ):
+        """Test that other API and unexpected errors map to ValueError"""
+        from lat import LatitudeAPIError
+
+        mock_get_api_key.return_value = "test-api-key"
+        exception_class = LatitudeAPIError if error == "api" else RuntimeError
+        mock_client_class.return_value.get_document.side_effect = exception_class(
+            "Server exploded"
+        )
+
+        with pytest.raises(ValueError, match=message):
+            latitude_template_loader(
+                "12345/550e8400-e29b-41d4-a716-446655440000/test", use_sdk=False
+            )
+
+    @patch.dict("sys.modules", {"utils": None})
+    @patch("llm_templates_latitude._get_api_key")
+    def test_latitude_template_loader_missing_utils(self, mock_get_api_key):
+        """Test that a missing utils module still surfaces as ValueError"""
+        mock_get_api_key.return_value = "test-api-key"
+
+        with pytest.raises(ValueError, match="Error loading template"):
+            latitude_template_loader(
+                "12345/550e8400-e29b-41d4-a716-446655440000/test", use_sdk=False
+            )
+
     @patch("llm_templates_latitude._get_api_key")
     def test_latitude_template_loader_missing_project_id(self, mock_get_api_key):
         """Test error when project ID is missing for document access"""
@@ -353,6 +519,44 @@ class TestFieldFiltering:
         assert "model" not in result["options"]
         assert "provider" not in result["options"]
 
+    def test_extract_template_data_priority_ignores_key_order(self):
+        """Test that field priority does not depend on response key order"""
+        latitude_data = {
+            "json_schema": {"type": "string"},
+            "options": {"max_tokens": 100},
+            "defaults": {"param": "fallback"},
+            "system_prompt": "Fallback system",
+            "prompt": "Fallback prompt",
+            "content": "Primary prompt",
+            "system": "Primary system",
+            "parameters": {"param": "primary"},
+            "model_config": {"temperature": 0.8},
+            "schema": {"type": "object"},
+        }
+
+        result = extract_template_data(latitude_data)
+
+        assert result == {
+            "prompt": "Primary prompt",
+            "system": "Primary system",
+            "defaults": {"param": "primary"},
+            "options": {"temperature": 0.8},
+            "schema_object": {"type": "object"},
+        }
+
+    def test_extract_template_data_fully_filtered_options(self):
+        """Test that options are omitted when every field is filtered out"""
+        latitude_data = {
+            "content": "Test prompt",
+            "model_config": {"model": "gpt-4", "provider": "openai"},
+            "options": {"temperature": 0.5},
+        }
+
+        result = extract_template_data(latitude_data)
+
+        # model_config takes priority, so the fallback field is not consulted
+        assert "options" not in result
+
     def test_extract_template_data_preserves_valid_fields(self):
         """Test that valid fields are preserved during filtering"""
         latitude_data = {
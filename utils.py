@@ -3,10 +3,13 @@ Common utilities for Latitude API clients
 """
 
 import re
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 # Constants
 PROBLEMATIC_FIELDS = ["model", "provider", "modelName", "recommended_model"]
+_UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
 
 
 class LatitudeAPIError(Exception):
@@ -37,8 +40,10 @@ def is_uuid_like(value: str) -> bool:
     Returns:
         bool: True if string matches UUID pattern
     """
-    uuid_pattern = r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
-    return bool(re.match(uuid_pattern, value.lower()))
+    # Cheap fixed-layout check first; only 8-4-4-4-12 shaped values hit the regex
+    if len(value) != 36 or not value[8] == value[13] == value[18] == value[23] == "-":
+        return False
+    return _UUID_RE.fullmatch(value) is not None
 
 
 def parse_template_path(template_path: str) -> Tuple[Optional[str], Optional[str], str]:
@@ -56,12 +61,23 @@ def parse_template_path(template_path: str) -> Tuple[Optional[str], Optional[str
     Raises:
         ValueError: If path format is invalid
     """
-    parts = template_path.split("/")
+    if not template_path:
+        raise ValueError("Template path cannot be empty")
 
-    if len(parts) >= 3:
+    if "/" not in template_path:
+        # Single part must be a UUID (not supported for documents)
+        if not is_uuid_like(template_path):
+            raise ValueError(f"Invalid format: {template_path}")
+
+        # This would be for listing documents, but that's not implemented
+        return None, template_path, ""
+
+    # Split at most twice so nested document paths stay intact
+    parts = template_path.split("/", 2)
+
+    if len(parts) == 3:
         # project_id/version_uuid/document_path (with possible nested paths)
-        project_id, version_uuid = parts[0], parts[1]
-        document_path = "/".join(parts[2:])  # Join remaining parts for nested paths
+        project_id, version_uuid, document_path = parts
 
         # Validate second part is UUID or "live"
         if version_uuid != "live" and not is_uuid_like(version_uuid):
@@ -69,27 +85,14 @@ def parse_template_path(template_path: str) -> Tuple[Optional[str], Optional[str
 
         return project_id, version_uuid, document_path
 
-    elif len(parts) == 2:
-        # version_uuid/document_path (no project_id)
-        version_uuid, document_path = parts
+    # version_uuid/document_path (no project_id)
+    version_uuid, document_path = parts
 
-        # Validate first part is UUID or "live"
-        if version_uuid != "live" and not is_uuid_like(version_uuid):
-            raise ValueError("Second part must be a version UUID or 'live'")
-
-        return None, version_uuid, document_path
-
-    elif len(parts) == 1:
-        # Single part must be a UUID (not supported for documents)
-        single_part = parts[0]
-        if not is_uuid_like(single_part):
-            raise ValueError(f"Invalid format: {template_path}")
+    # Validate first part is UUID or "live"
+    if version_uuid != "live" and not is_uuid_like(version_uuid):
+        raise ValueError("Second part must be a version UUID or 'live'")
 
-        # This would be for listing documents, but that's not implemented
-        return None, single_part, ""
-
-    else:
-        raise ValueError(f"Invalid template path format: {template_path}")
+    return None, version_uuid, document_path
 
 
 def convert_latitude_variables(text: str) -> str:
@@ -140,6 +143,26 @@ def filter_problematic_fields(options: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+# Fields holding the prompt content, in priority order
+_CONTENT_FIELDS = ("content", "prompt")
+
+# (output key, source fields in priority order, required type, transform)
+# A required type of None means the field is used only when truthy.
+_OPTIONAL_FIELDS: Tuple[
+    Tuple[str, Tuple[str, ...], Optional[type], Optional[Callable[[Any], Any]]], ...
+] = (
+    ("system", ("system", "system_prompt"), None, convert_latitude_variables),
+    ("defaults", ("parameters", "defaults"), dict, None),
+    ("options", ("model_config", "options"), dict, filter_problematic_fields),
+    ("schema_object", ("schema", "json_schema"), None, None),
+)
+
+# Every response field extract_template_data may read
+TEMPLATE_SOURCE_FIELDS: Tuple[str, ...] = _CONTENT_FIELDS + tuple(
+    field for _, source_fields, _, _ in _OPTIONAL_FIELDS for field in source_fields
+)
+
+
 def extract_template_data(latitude_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Extract template configuration from Latitude API response
@@ -153,11 +176,12 @@ def extract_template_data(latitude_data: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(latitude_data, dict):
         raise ValueError("Expected dict from Latitude API")
 
-    # Get content from various possible field names
+    # Get content from various possible field names; an explicit null falls
+    # through to the next field, while an empty string is kept as content
     content = None
-    for content_field in ["content", "prompt"]:
-        if content_field in latitude_data:
-            content = latitude_data[content_field]
+    for content_field in _CONTENT_FIELDS:
+        content = latitude_data.get(content_field)
+        if content is not None:
             break
 
     if content is None:
@@ -170,39 +194,23 @@ def extract_template_data(latitude_data: Dict[str, Any]) -> Dict[str, Any]:
     prompt_content = convert_latitude_variables(prompt_content)
 
     # Start building template config
-    template_config = {"prompt": prompt_content}
-
-    # Add system prompt if present and convert variables
-    for system_field in ["system", "system_prompt"]:
-        if system_field in latitude_data and latitude_data[system_field]:
-            template_config["system"] = convert_latitude_variables(
-                latitude_data[system_field]
-            )
-            break
-
-    # Add default parameters if present
-    for param_field in ["parameters", "defaults"]:
-        if param_field in latitude_data and isinstance(
-            latitude_data[param_field], dict
-        ):
-            template_config["defaults"] = latitude_data[param_field]
-            break
-
-    # Process model configuration options
-    for option_field in ["model_config", "options"]:
-        if option_field in latitude_data and isinstance(
-            latitude_data[option_field], dict
-        ):
-            # Filter out problematic fields
-            filtered_options = filter_problematic_fields(latitude_data[option_field])
-            if filtered_options:
-                template_config["options"] = filtered_options
-            break
-
-    # Add JSON schema if present
-    for schema_field in ["schema", "json_schema"]:
-        if schema_field in latitude_data and latitude_data[schema_field]:
-            template_config["schema_object"] = latitude_data[schema_field]
+    template_config: Dict[str, Any] = {"prompt": prompt_content}
+
+    # Optional fields: first matching source field wins for each output key
+    for output_key, source_fields, expected_type, transform in _OPTIONAL_FIELDS:
+        for field in source_fields:
+            value = latitude_data.get(field)
+            if expected_type is None:
+                if not value:
+                    continue
+            elif not isinstance(value, expected_type):
+                continue
+
+            if transform is not None:
+                value = transform(value)
+                if not value:
+                    break
+            template_config[output_key] = value
             break
 
     return template_config